@@ -1,5 +1,6 @@
 """Blocksat API"""
 import os, getpass, textwrap, logging, subprocess, shlex
+from concurrent.futures import ThreadPoolExecutor
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter, \
     ArgumentTypeError
 import qrcode
@@ -10,6 +11,7 @@ from .order import ApiOrder
 from .msg import ApiMsg
 from .pkt import BlocksatPkt, BlocksatPktHandler, calc_ota_msg_len, ApiChannel
 from .demorx import DemoRx
+from .fec import Fec
 from . import bidding, net
 from .gpg import Gpg
 
@@ -221,6 +223,89 @@ def send(args):
         pass
 
 
+def _process_rx_msg(args, data, gpg, download_dir, historian_cli):
+    """Decrypt/decapsulate a received API message and deliver it
+
+    Args:
+        args          : Arguments of the listen command.
+        data          : Data decoded from the Blocksat Packets that carried the
+                        API message.
+        gpg           : Gpg object, or None if not decrypting or verifying
+                        messages.
+        download_dir  : Directory where downloaded files are saved.
+        historian_cli : Path to the historian-cli application (gossip mode).
+
+    """
+    if (args.plaintext):
+        if (args.save_raw):
+            # Assume that the message is not encapsulated. This mode is
+            # useful, e.g., for compatibility with transmissions triggered
+            # from the browser at: https://blockstream.com/satellite-queue/.
+            msg = ApiMsg(data, msg_format="original")
+        else:
+            # Encapsulated format, but no encryption
+            msg = ApiMsg(data, msg_format="encapsulated")
+
+            # Try to decapsulate it
+            if (not msg.decapsulate()):
+                return
+
+        # If filtering clearsigned messages, verify
+        if (args.sender and not msg.verify(gpg, args.sender)):
+            return
+
+        logger.info("Message Size: {:d} bytes\tSaving in plaintext".format(
+            msg.get_length(target='original')))
+
+    else:
+        # Cast data into ApiMsg object in encrypted form
+        msg = ApiMsg(data, msg_format="encrypted")
+
+        # Try to decrypt the data:
+        if (not msg.decrypt(gpg, args.sender)):
+            return
+
+        # Try to decapsulate the application-layer structure if assuming it
+        # is present (i.e., with "save-raw=False")
+        if (not args.save_raw and not msg.decapsulate()):
+            return
+
+    # Finalize the processing of the decoded message
+    if (args.stdout):
+        msg.serialize()
+    elif (not args.no_save):
+        download_path = msg.save(download_dir)
+
+    if (args.echo):
+        # Not all messages can be decoded in UTF-8 (binary files
+        # cannot). Also, messages that were not sent in plaintext and raw
+        # (non-encapsulated) format. Echo the results only when the UTF-8
+        # decoding works.
+        try:
+            logger.info("Message:\n\n {} \n".format(
+                msg.data['original'].decode()))
+        except UnicodeDecodeError:
+            logger.debug("Message not decodable in UFT-8")
+    else:
+        logger.debug("Message: %s", msg.data['original'])
+
+    if (args.exec):
+        cmd = shlex.split(
+            args.exec.replace("{}", shlex.quote(download_path))
+        )
+        logger.debug("Exec:\n> {}".format(" ".join(cmd)))
+        subprocess.run(cmd)
+
+    if (args.gossip):
+        cmd = [historian_cli, 'snapshot', 'load',
+               shlex.quote(download_path)]
+        if (args.historian_destination is not None):
+            cmd.append(args.historian_destination)
+
+        logger.debug("Exec:\n> {}".format(" ".join(cmd)))
+        subprocess.run(cmd)
+
+
 def listen(args):
     """Listen to API messages received over satellite"""
     gnupghome     = os.path.join(args.cfg_dir, args.gnupghome)
@@ -307,6 +392,7 @@ def listen(args):
     logger.info("Downloads will be saved at: {}".format(download_dir))
 
     # GPG wrapper object
+    gpg = None
     if (not args.plaintext or args.sender):
         gpg = Gpg(gnupghome, interactive=True)
 
@@ -327,143 +413,108 @@ def listen(args):
     # Set of decoded messages (to avoid repeated decoding)
     decoded_msgs = set()
 
-    logger.info("Waiting for data...")
-    while True:
-        try:
-            udp_payload, addr = sock.recv()
-        except KeyboardInterrupt:
-            break;
-
-        # Cast payload to BlocksatPkt object
-        pkt = BlocksatPkt()
-        pkt.unpack(udp_payload)
-
-        # Filter API channel
-        if (channel != ApiChannel.ALL.value and pkt.chan_num != channel):
-            logger.debug("Packet discarded (channel {:d})".format(pkt.chan_num))
-            continue
-
-        # Feed new packet into the packet handler
-        all_frags_received = pkt_handler.append(pkt)
-
-        # Decode each message only once
-        seq_num = pkt.seq_num
-        if (seq_num in decoded_msgs):
-            logger.debug("Message {} has already been decoded".format(seq_num))
-            continue
-
-        # Assume that the incoming message has forward error correction (FEC)
-        # encoding. With FEC, the message may become decodable before receiving
-        # all fragments (BlocksatPkts). For every packet, check if the FEC data
-        # is decodable already and proceed with the processing in the positive
-        # case. If the message is not actually FEC-encoded, it will never assert
-        # the "fec_decodable" flag. In this case, proceed with the processing
-        # only when all fragments are received.
-        msg = ApiMsg(pkt_handler.concat(seq_num, force=True),
-                     msg_format="fec_encoded")
-        fec_decodable = msg.is_fec_decodable()
-        if (not fec_decodable and not all_frags_received):
-            continue
-
-        # API message is ready to be decoded
-        logger.info("-------- API message {:d}".format(seq_num))
-        logger.debug("Message source: {}:{}".format(addr[0], addr[1]))
-        logger.info("Fragments: {:d}".format(pkt_handler.get_n_frags(seq_num)))
-
-        # Send confirmation of reception to API server
-        order = ApiOrder(server_addr, seq_num=seq_num, tls_cert=args.tls_cert,
-                         tls_key=args.tls_key)
-        order.confirm_rx(args.region)
-
-        # Decode the data from the available FEC chunks or from the complete
-        # collection of Blocksat Packets
-        if (fec_decodable):
-            msg.fec_decode()
-            data = msg.data['original']
-        else:
-            data = pkt_handler.concat(seq_num)
+    # Worker that decrypts and delivers the decoded messages in the background
+    rx_executor = ThreadPoolExecutor(max_workers=1)
+    rx_future   = None
 
-        # Mark as decoded
-        decoded_msgs.add(seq_num)
-
-        # Delete message from the packet handler
-        del pkt_handler.frag_map[seq_num]
+    logger.info("Waiting for data...")
+    try:
+        while True:
+            try:
+                udp_payload, addr = sock.recv()
+            except KeyboardInterrupt:
+                break;
 
-        # Clean up old (timed-out) messages from the packet handler
-        pkt_handler.clean()
+            # Stop if the processing of the previous message has failed
+            if (rx_future is not None and rx_future.done()):
+                rx_future.result()
 
-        if (len(data) <= 0):
-            logger.warning("Empty message")
-            continue
+            # Cast payload to BlocksatPkt object
+            pkt = BlocksatPkt()
+            if (not pkt.unpack(udp_payload)):
+                continue
 
-        if (args.plaintext):
-            if (args.save_raw):
-                # Assume that the message is not encapsulated. This mode is
-                # useful, e.g., for compatibility with transmissions triggered
-                # from the browser at: https://blockstream.com/satellite-queue/.
-                msg = ApiMsg(data, msg_format="original")
-            else:
-                # Encapsulated format, but no encryption
-                msg = ApiMsg(data, msg_format="encapsulated")
+            # Filter API channel
+            if (channel != ApiChannel.ALL.value and pkt.chan_num != channel):
+                logger.debug("Packet discarded (channel %d)", pkt.chan_num)
+                continue
 
-                # Try to decapsulate it
-                if (not msg.decapsulate()):
-                    continue
+            # Feed new packet into the packet handler
+            all_frags_received = pkt_handler.append(pkt)
 
-            # If filtering clearsigned messages, verify
-            if (args.sender and not msg.verify(gpg, args.sender)):
+            # Decode each message only once
+            seq_num = pkt.seq_num
+            if (seq_num in decoded_msgs):
+                logger.debug("Message %s has already been decoded", seq_num)
                 continue
 
-            logger.info("Message Size: {:d} bytes\tSaving in plaintext".format(
-                msg.get_length(target='original')))
+            # Assume that the incoming message has forward error correction
+            # (FEC) encoding. With FEC, the message may become decodable before
+            # receiving all fragments (BlocksatPkts). For every packet, check if
+            # the FEC data is decodable already and proceed with the processing
+            # in the positive case. If the message is not actually FEC-encoded,
+            # it will never assert the "fec_decodable" flag. In this case,
+            # proceed with the processing only when all fragments are received.
+            #
+            # NOTE: check the FEC decodability on a view of the concatenation
+            # cache. This way, the message is copied only once it is ready to
+            # be decoded, rather than on every incoming packet.
+            with pkt_handler.get_concat_view(seq_num) as concat_view:
+                fec_decodable = Fec().is_decodable(concat_view)
+
+            if (not fec_decodable and not all_frags_received):
+                continue
 
-        else:
-            # Cast data into ApiMsg object in encrypted form
-            msg = ApiMsg(data, msg_format="encrypted")
+            # Process at most one message at a time. Wait for the previous
+            # message before logging and handing over the next one, so that the
+            # logs of each message stay grouped under its header.
+            if (rx_future is not None):
+                rx_future.result()
+
+            # API message is ready to be decoded
+            logger.info("-------- API message {:d}".format(seq_num))
+            logger.debug("Message source: %s:%s", addr[0], addr[1])
+            logger.info("Fragments: {:d}".format(
+                pkt_handler.get_n_frags(seq_num)))
+
+            # Send confirmation of reception to API server
+            order = ApiOrder(server_addr, seq_num=seq_num,
+                             tls_cert=args.tls_cert, tls_key=args.tls_key)
+            order.confirm_rx(args.region)
+
+            # Decode the data from the available FEC chunks or from the
+            # complete collection of Blocksat Packets
+            if (fec_decodable):
+                msg = ApiMsg(pkt_handler.concat(seq_num, force=True),
+                             msg_format="fec_encoded")
+                msg.fec_decode()
+                data = msg.data['original']
+            else:
+                data = pkt_handler.concat(seq_num)
 
-            # Try to decrypt the data:
-            if (not msg.decrypt(gpg, args.sender)):
-                continue
+            # Mark as decoded
+            decoded_msgs.add(seq_num)
 
-            # Try to decapsulate the application-layer structure if assuming it
-            # is present (i.e., with "save-raw=False")
-            if (not args.save_raw and not msg.decapsulate()):
-                continue
+            # Delete message from the packet handler
+            del pkt_handler.frag_map[seq_num]
 
-        # Finalize the processing of the decoded message
-        if (args.stdout):
-            msg.serialize()
-        elif (not args.no_save):
-            download_path = msg.save(download_dir)
-
-        if (args.echo):
-            # Not all messages can be decoded in UTF-8 (binary files
-            # cannot). Also, messages that were not sent in plaintext and raw
-            # (non-encapsulated) format. Echo the results only when the UTF-8
-            # decoding works.
-            try:
-                logger.info("Message:\n\n {} \n".format(
-                    msg.data['original'].decode()))
-            except UnicodeDecodeError:
-                logger.debug("Message not decodable in UFT-8")
-        else:
-            logger.debug("Message: {}".format(msg.data['original']))
+            # Clean up old (timed-out) messages from the packet handler
+            pkt_handler.clean()
 
-        if (args.exec):
-            cmd = shlex.split(
-                args.exec.replace("{}", shlex.quote(download_path))
-            )
-            logger.debug("Exec:\n> {}".format(" ".join(cmd)))
-            subprocess.run(cmd)
+            if (len(data) <= 0):
+                logger.warning("Empty message")
+                continue
 
-        if (args.gossip):
-            cmd = [historian_cli, 'snapshot', 'load',
-                   shlex.quote(download_path)]
-            if (args.historian_destination is not None):
-                cmd.append(args.historian_destination)
+            # Hand the message over for decryption and delivery while the
+            # socket keeps being read
+            rx_future = rx_executor.submit(_process_rx_msg, args, data, gpg,
+                                           download_dir, historian_cli)
 
-            logger.debug("Exec:\n> {}".format(" ".join(cmd)))
-            subprocess.run(cmd)
+        # Finish processing the last message before exiting
+        if (rx_future is not None):
+            rx_future.result()
+    finally:
+        rx_executor.shutdown()
 
 
 def bump(args):
@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 # Octet 7      : Reserved
 HEADER_FORMAT = '!BBBIx'
 HEADER_LEN    = 8
+HEADER_STRUCT = struct.Struct(HEADER_FORMAT)
 # Each FEC packet (chunk + metadata) should fit a single Blocksat Packet
 PKT_SIZE       = pkt.MAX_PAYLOAD
 CHUNK_SIZE     = PKT_SIZE - HEADER_LEN
@@ -96,10 +97,9 @@ class Fec:
         n_fec_chunks      = n_chunks + n_overhead_chunks
 
         assert(n_fec_chunks <= MAX_FEC_CHUNKS)
-        logger.debug("Original Chunks: {} / "
-                     "Overhead Chunks: {} / "
-                     "Total: {}".format(
-                         n_chunks, n_overhead_chunks, n_fec_chunks))
+        logger.debug("Original Chunks: %d / "
+                     "Overhead Chunks: %d / "
+                     "Total: %d", n_chunks, n_overhead_chunks, n_fec_chunks)
 
         # Split the given data array into chunks
         chunks = []
@@ -148,8 +148,8 @@ class Fec:
         max_obj_size  = floor(MAX_FEC_CHUNKS / (1 + self.overhead)) * CHUNK_SIZE
         n_fec_objects = ceil(len(data) / max_obj_size)
 
-        logger.debug("Message Size: {} / FEC Objects: {}".format(
-            len(data), n_fec_objects))
+        logger.debug("Message Size: %d / FEC Objects: %d", len(data),
+                     n_fec_objects)
 
         # Generate the FEC packets from (potentially) multiple FEC objects
         fec_pkts = []
@@ -158,14 +158,14 @@ class Fec:
             e_byte     = (i_obj + 1) * max_obj_size # ending byte
             fec_object = data[s_byte:e_byte]
 
-            logger.debug("FEC Object: {}".format(i_obj))
+            logger.debug("FEC Object: %d", i_obj)
 
             fec_chunks = self._encode_obj(fec_object)
 
             # FEC packets
             for i_chunk, chunk in enumerate(fec_chunks):
-                metadata = struct.pack(HEADER_FORMAT, i_obj, n_fec_objects,
-                                       i_chunk, len(fec_object))
+                metadata = HEADER_STRUCT.pack(i_obj, n_fec_objects, i_chunk,
+                                              len(fec_object))
                 fec_pkts.append(metadata + chunk)
 
         # Concatenate all FEC packets to form a single encoded data
@@ -226,39 +226,49 @@ class Fec:
         # Remove any zero-padding that may have been applied to the last chunk:
         return decoded_obj[:obj_len]
 
-    def _is_decodable(self, data):
-        """Check if the FEC-encoded data is decodable
+    def _index(self, data):
+        """Index the FEC packets of a FEC-encoded data array
+
+        Parse the header of each FEC packet and map the FEC objects and chunks
+        contained in the given data, while validating that the data is
+        decodable.
 
         Args:
             data : FEC-encoded data, a bytes array with multiple FEC packets
                    serially.
 
         Note: This is a faster processing tailored specifically to validate the
-             given FEC-encoded data. Unlike method decode(), it does not make
-             any expensive memory copying. The rationale is that the data will
-             not be ready to be decoded most of the time. Hence, it is better to
-             check if decodable separately than to try and decode it in one go.
+             given FEC-encoded data. It does not make any expensive memory
+             copying. Instead, it maps each FEC chunk to its starting byte
+             within the data array. The rationale is that the data will not be
+             ready to be decoded most of the time. Hence, it is better to check
+             if decodable separately than to try and decode it in one go.
+
+        Returns:
+            None if the data is not decodable. Otherwise, a tuple with the
+            number of FEC objects and a dictionary mapping each FEC object id
+            to the object length and to the starting byte of each FEC chunk
+            (keyed by chunk id).
 
         """
 
         # The encoded data must contain an integer number of FEC packets,
         # although it may not contain the full FEC-encoded object(s), given that
         # some parts of it may have been lost.
-        if (len(data) % PKT_SIZE != 0):
+        if (len(data) == 0 or len(data) % PKT_SIZE != 0):
             logger.debug("Not a properly formatted FEC-encoded object")
-            return False
+            return None
 
         # Process each packet and create a map of FEC objects and chunks
         n_fec_pkts    = len(data) // PKT_SIZE
         fec_map       = {}
         n_fec_objects = None
         for i_fec_pkt in range(n_fec_pkts):
-            # Byte range of the next header (don't process the payload here):
-            s_byte  = i_fec_pkt * PKT_SIZE # starting byte
-            e_byte  = s_byte + HEADER_LEN  # ending byte
+            # Starting byte of the next header (don't process the payload here)
+            s_byte  = i_fec_pkt * PKT_SIZE
 
             # Unpack the metadata from the FEC header
-            metadata = struct.unpack(HEADER_FORMAT, data[s_byte:e_byte])
+            metadata = HEADER_STRUCT.unpack_from(data, s_byte)
             obj_id   = metadata[0]
             chunk_id = metadata[2]
             obj_len  = metadata[3]
@@ -266,19 +276,20 @@ class Fec:
             # Check if the chunk id is valid
             if (chunk_id >= MAX_FEC_CHUNKS):
                 logger.debug("Invalid chunk id - likely not FEC-encoded")
-                return False
+                return None
 
             # All packets of a FEC object should bring the same message length
             if (obj_id not in fec_map):
                 fec_map[obj_id] = {
-                    'len'      : obj_len,
-                    'n_chunks' : 0
+                    'len'    : obj_len,
+                    'chunks' : {}
                 }
-                # NOTE: keep the count of chunks here (not the actual chunks).
+                # NOTE: keep the position of the chunks here (not the actual
+                # chunks).
             elif (obj_len != fec_map[obj_id]['len']):
                 logger.debug("Inconsistent message length on FEC packets - "
                              "likely not FEC-encoded")
-                return False
+                return None
 
             # All FEC packets should bring the same metadata information
             # regarding the number of FEC objects
@@ -287,29 +298,43 @@ class Fec:
             elif (n_fec_objects != metadata[1]):
                 logger.debug("Inconsistent number of FEC objects - "
                              "likely not FEC-encoded")
-                return False
+                return None
 
-            # Increment the count of FEC chunks
-            fec_map[obj_id]['n_chunks'] += 1
+            # Starting byte of the FEC chunk
+            fec_map[obj_id]['chunks'][chunk_id] = s_byte + HEADER_LEN
 
-        # The decoder needs all the FEC objects
-        if (n_fec_objects > len(fec_map)):
+        # The decoder needs all the FEC objects, i.e., every id within
+        # range(n_fec_objects). This check also covers maps with fewer objects
+        # than n_fec_objects, and maps where object ids outside that range
+        # take the place of required ones, as both leave some id in the range
+        # missing. Any extra ids beyond the range are ignored by decode().
+        if (any([i_obj not in fec_map for i_obj in range(n_fec_objects)])):
             logger.debug("Insufficient number of FEC objects")
-            return False
+            return None
 
         # All FEC objects should contain enough FEC chunks
         ready = n_fec_objects * [False]
         for i_obj in range(n_fec_objects):
             n_chunks     = ceil(fec_map[i_obj]['len'] / CHUNK_SIZE)
-            ready[i_obj] = fec_map[i_obj]['n_chunks'] >= n_chunks
+            ready[i_obj] = len(fec_map[i_obj]['chunks']) >= n_chunks
 
         if (not all(ready)):
             logger.debug("Insufficient number of FEC chunks")
-            return False
+            return None
 
         logger.debug("Object decodable")
 
-        return True
+        return n_fec_objects, fec_map
+
+    def is_decodable(self, data):
+        """Check if the FEC-encoded data is decodable
+
+        Args:
+            data : FEC-encoded data, a bytes-like object (e.g., a bytes array or
+                   a memoryview) with multiple FEC packets serially.
+
+        """
+        return self._index(data) is not None
 
     def decode(self, data):
         """Decode a sequence of FEC packets spanning multiple FEC objects
@@ -325,44 +350,24 @@ class Fec:
         """
 
         # Check if the given FEC-encoded can decoded before anything to avoid
-        # the more expensive message decoding that follows.
-        if (not self._is_decodable(data)):
+        # the more expensive message decoding that follows. On success, reuse
+        # the map of FEC objects and chunks produced by the validation.
+        index = self._index(data)
+        if (index is None):
             return False
 
-        # Process each packet and create a map of FEC objects and chunks
-        n_fec_pkts    = len(data) // PKT_SIZE
-        fec_map       = {}
-        n_fec_objects = None
-        for i_fec_pkt in range(n_fec_pkts):
-            # Byte range of the next FEC packet:
-            s_byte  = i_fec_pkt * PKT_SIZE       # starting byte
-            e_byte  = (i_fec_pkt + 1) * PKT_SIZE # ending byte
-            fec_pkt = data[s_byte:e_byte]
+        n_fec_objects, fec_map = index
 
-            # Unpack the metadata from the FEC header
-            obj_id, n_fec_objects, chunk_id, obj_len = struct.unpack(
-                HEADER_FORMAT, fec_pkt[:HEADER_LEN])
-
-            # Save the FEC object length and the FEC chunk
-            if (obj_id not in fec_map):
-                fec_map[obj_id] = {
-                    'len'    : obj_len,
-                    'chunks' : {}
-                }
-
-            fec_map[obj_id]['chunks'][chunk_id] = fec_pkt[HEADER_LEN:]
-
-        logger.debug("Processed chunks: {} / Processed objects: {}".format(
-            n_fec_pkts, len(fec_map)))
+        logger.debug("Processed chunks: %d / Processed objects: %d",
+                     len(data) // PKT_SIZE, len(fec_map))
 
         # Decode multiple objects and concatenate the decoded data
         decoded_data = bytearray()
         for i_obj in range(n_fec_objects):
-            decoded_data += self._decode_obj(
-                fec_map[i_obj]['len'],
-                list(fec_map[i_obj]['chunks'].values()),
-                list(fec_map[i_obj]['chunks'].keys())
-            )
+            chunk_ids = list(fec_map[i_obj]['chunks'].keys())
+            chunks    = [data[s_byte:s_byte + CHUNK_SIZE] for s_byte in
+                         fec_map[i_obj]['chunks'].values()]
+            decoded_data += self._decode_obj(fec_map[i_obj]['len'], chunks,
+                                             chunk_ids)
 
         return bytes(decoded_data)
-
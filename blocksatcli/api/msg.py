@@ -1,5 +1,5 @@
 """API Messages"""
-import sys, os, logging, time, struct, zlib, hashlib
+import sys, os, logging, time, struct, zlib
 from math import ceil, floor
 import zfec
 from . import pkt
@@ -13,6 +13,7 @@ logger            = logging.getLogger(__name__)
 # Octets 256 - 259 : CRC32 checksum
 MSG_HEADER_FORMAT = '<255sxI'
 MSG_HEADER_LEN    = 255 + 1 + 4
+MSG_HEADER_STRUCT = struct.Struct(MSG_HEADER_FORMAT)
 data_formats      = ["original", "encapsulated", "encrypted", "fec_encoded"]
 
 
@@ -55,14 +56,14 @@ class ApiMsg:
 
         # The input data fills one of the containers:
         self.data[msg_format] = data
-        logger.debug("{} message has {:d} bytes".format(
-            msg_format.replace("_", " ").title(), len(data)))
+        logger.debug("%s message has %d bytes",
+                     msg_format.replace("_", " ").title(), len(data))
 
         # When the file name is empty, use a timestamp:
         self.filename = filename if filename is not None else \
                         time.strftime("%Y%m%d%H%M%S")
         if (filename is not None):
-            logger.debug("File name: {}".format(filename))
+            logger.debug("File name: %s", filename)
 
     def get_data(self, target=None):
         """Return message data
@@ -113,14 +114,13 @@ class ApiMsg:
         """
         orig_data = self.data["original"]
         crc32     = zlib.crc32(orig_data)
-        header    = struct.pack(MSG_HEADER_FORMAT, self.filename.encode(),
-                                crc32)
+        header    = MSG_HEADER_STRUCT.pack(self.filename.encode(), crc32)
 
         self.data['encapsulated'] = header + orig_data
 
-        logger.debug("Checksum: {:d}".format(crc32))
-        logger.debug("Packed in data structure with a total of %d bytes" %(
-            len(self.data['encapsulated'])))
+        logger.debug("Checksum: %d", crc32)
+        logger.debug("Packed in data structure with a total of %d bytes",
+                     len(self.data['encapsulated']))
 
     def decapsulate(self):
         """Decapsulate the data structure
@@ -140,8 +140,7 @@ class ApiMsg:
             return False
 
         # Parse the header
-        header        = struct.unpack(MSG_HEADER_FORMAT,
-                                      encap_data[:MSG_HEADER_LEN])
+        header        = MSG_HEADER_STRUCT.unpack_from(encap_data)
         try:
             self.filename = header[0].rstrip(b'\0').decode()
         except UnicodeDecodeError:
@@ -185,10 +184,10 @@ class ApiMsg:
         data = self.data['encapsulated'] if self.data['encapsulated'] \
                else self.data['original']
 
-        logger.debug("Encrypt for recipient %s" %(recipient))
+        logger.debug("Encrypt for recipient %s", recipient)
 
         if (sign and sign != True):
-            logger.debug("Sign message using key %s" %(sign))
+            logger.debug("Sign message using key %s", sign)
 
         encrypted_obj = gpg.encrypt(data, recipient, always_trust = trust,
                                     sign = sign)
@@ -197,8 +196,8 @@ class ApiMsg:
             raise ValueError(encrypted_obj.status)
 
         self.data['encrypted'] = encrypted_obj.data
-        logger.debug("Encrypted version of the data structure has %d bytes" %(
-            len(self.data['encrypted'])))
+        logger.debug("Encrypted version of the data structure has %d bytes",
+                     len(self.data['encrypted']))
 
     def decrypt(self, gpg, signer_filter=None):
         """Decrypt the data
@@ -261,7 +260,9 @@ class ApiMsg:
                 logger.warning("Dropping message - signature unverified")
                 return False
 
-        logger.info("Decrypted size: %7d bytes" %(len(str(decrypted_data))))
+        # NOTE: take the length of the decrypted bytes directly. Casting the
+        # result to str would decode the entire (possibly binary) plaintext.
+        logger.info("Decrypted size: %7d bytes" %(len(decrypted_data.data)))
 
         # We can't know whether decrypted data is encapsulated or not. So, for
         # now, put the data into both fields. If the decrypted data is
@@ -292,12 +293,12 @@ class ApiMsg:
         """
         data = self.data['original']
 
-        logger.debug("Sign message using key %s" %(sign_key))
+        logger.debug("Sign message using key %s", sign_key)
 
         signed_obj = gpg.sign(data, sign_key)
 
-        logger.debug("Signed version of the data structure has %d bytes" %(
-            len(signed_obj.data)))
+        logger.debug("Signed version of the data structure has %d bytes",
+                     len(signed_obj.data))
 
         self.data['original'] = signed_obj.data
 
@@ -416,9 +417,10 @@ class ApiMsg:
         """
         assert(self.data['fec_encoded'] is not None)
 
+        # Validate the FEC packet headers only. The actual decoding happens
+        # once, later, on the call to "fec_decode()".
         fec = Fec()
-        res = fec.decode(self.data['fec_encoded'])
-        return res != False
+        return fec.is_decodable(self.data['fec_encoded'])
 
     def save(self, dst_dir, target='original'):
         """Save data into a file
@@ -446,22 +448,20 @@ class ApiMsg:
         assert(isinstance(data, bytes))
 
         # Save file into a specific directory
-        if not os.path.exists(dst_dir):
-            os.makedirs(dst_dir)
+        os.makedirs(dst_dir, exist_ok=True)
 
         # If the file already exists, check if it has the same contents as the
-        # data array to be saved. Return in the positive case (no need to save).
+        # data array to be saved. Return in the positive case (no need to
+        # save). Compare the file size first so that the existing file is only
+        # read when it could have the same contents.
         dst_file = os.path.join(dst_dir, self.filename)
 
-        if os.path.exists(dst_file):
-            # sha256 hash of the existing file
+        if (os.path.isfile(dst_file) and
+            os.path.getsize(dst_file) == len(data)):
             with open(dst_file, "rb") as fd:
-                existing_hash = hashlib.sha256(fd.read()).hexdigest()
+                existing_data = fd.read()
 
-            # sha256 hash of the incoming data
-            incoming_hash = hashlib.sha256(data).hexdigest()
-
-            if (incoming_hash == existing_hash):
+            if (existing_data == data):
                 logger.info("File {} already exists.".format(dst_file))
                 return dst_file
 
@@ -477,9 +477,8 @@ class ApiMsg:
             dst_file = os.path.join(dst_dir, filename + "-" + str(i_file) + ext)
 
         # Write file with user data
-        f = open(dst_file, 'wb')
-        f.write(data)
-        f.close()
+        with open(dst_file, 'wb') as fd:
+            fd.write(data)
 
         logger.info("Saved at {}.".format(dst_file))
         return dst_file
@@ -29,7 +29,7 @@ class UdpSock():
 
         assert(self.ip is not None), "UDP source IP is not defined"
         assert(self.port is not None), "UDP port is not defined"
-        logger.debug("Connect with UDP socket %s:%s" %(self.ip, self.port))
+        logger.debug("Connect with UDP socket %s:%s", self.ip, self.port)
 
         try:
             # Open and bind socket to Blocksat API port
@@ -70,13 +70,11 @@ class UdpSock():
     def _join_mcast_group(self):
         """Join multicast group on the chosen interface"""
         if (self.ifindex != 0):
-            logger.debug("Join multicast group %s on network interface %d" %(
-                self.ip, self.ifindex
-            ))
+            logger.debug("Join multicast group %s on network interface %d",
+                         self.ip, self.ifindex)
         else:
-            logger.debug("Join group %s with the default network interface" %(
-                self.ip
-            ))
+            logger.debug("Join group %s with the default network interface",
+                         self.ip)
 
         ip_mreqn = struct.pack('4s4si',
                                socket.inet_aton(self.ip),
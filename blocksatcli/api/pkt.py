@@ -12,6 +12,7 @@ HEADER_FORMAT      = '!cBHI'
 # octets 2-3 : Fragment number
 # octets 4-7 : Sequence number
 HEADER_LEN         = 8
+HEADER_STRUCT      = struct.Struct(HEADER_FORMAT)
 TYPE_API_DATA      = b'\x01'
 API_TYPE_LAST_FRAG = b'\x01' # Type=1 (API), MF=0
 API_TYPE_MORE_FRAG = b'\x81' # Type=1 (API), MF=1
@@ -73,8 +74,8 @@ class BlocksatPkt:
         """
         # Assert the "more fragments" (MF) bit if this isn't the last fragment
         octet_0 = API_TYPE_MORE_FRAG if self.more_frags else API_TYPE_LAST_FRAG
-        header = struct.pack(HEADER_FORMAT, octet_0, self.chan_num,
-                             self.frag_num, self.seq_num)
+        header = HEADER_STRUCT.pack(octet_0, self.chan_num, self.frag_num,
+                                    self.seq_num)
         return header + self.payload
 
     def unpack(self, udp_payload):
@@ -84,28 +85,39 @@ class BlocksatPkt:
             udp_payload : UDP payload received via socket (bytes)
 
         Returns:
-            Tuple with the Blocksat Packet's payload (bytes) and sequence number
+            (bool) Whether the UDP payload holds a valid Blocksat Packet.
 
         """
         assert(isinstance(udp_payload, bytes))
-        assert(len(udp_payload) >= HEADER_LEN)
 
-        # Separate header and payload
-        header       = udp_payload[:HEADER_LEN]
-        self.payload = udp_payload[HEADER_LEN:]
+        # Sanity check: validate the length and the type bit before any
+        # parsing, so that stray datagrams are discarded cheaply and the
+        # receiver can move on to the next packet.
+        if (len(udp_payload) < HEADER_LEN):
+            logger.debug("BlocksatPkt: Discarding %d-byte datagram (shorter "
+                         "than the header)", len(udp_payload))
+            return False
 
-        # Parse header
-        octet_0, self.chan_num, self.frag_num, self.seq_num = struct.unpack(
-            HEADER_FORMAT, header)
+        if (not (udp_payload[0] & 1)):
+            logger.debug("BlocksatPkt: Discarding non-API packet")
+            return False
 
-        # Sanity check
-        assert(ord(octet_0) & 1), "Not an API packet"
+        # Keep the payload as a read-only view of the received datagram so
+        # that it is copied only once, when concatenated into the message by
+        # the BlocksatPktHandler.
+        self.payload = memoryview(udp_payload)[HEADER_LEN:]
+
+        # Parse header
+        octet_0, self.chan_num, self.frag_num, self.seq_num = \
+            HEADER_STRUCT.unpack_from(udp_payload)
 
         # Are there more fragments coming?
         self.more_frags = bool(ord(octet_0) & ord(b'\x80'))
 
-        logger.debug("BlocksatPkt: Seq Num: {} / Frag Num: {} / MF: {}".format(
-            self.seq_num, self.frag_num, self.more_frags))
+        logger.debug("BlocksatPkt: Seq Num: %s / Frag Num: %s / MF: %s",
+                     self.seq_num, self.frag_num, self.more_frags)
+
+        return True
 
     def __len__(self):
         return HEADER_LEN + len(self.payload)
@@ -172,16 +184,18 @@ class BlocksatPktHandler:
         """Concatenate a single BlocksatPkt within a concatenation cache"""
         seq_num = pkt.seq_num
 
-        # If it's an out-of-order packet, re-compute the concatenated
-        # version. Otherwise, just append directly to the cache.
+        # If it's an out-of-order packet, splice its payload into the cache
+        # right after the payloads of the preceding fragments, instead of
+        # re-computing the whole concatenated version. Otherwise, just append
+        # directly to the cache.
         if (self.frag_map[seq_num]['high_frag'] is not None and
             pkt.frag_num < self.frag_map[seq_num]['high_frag']):
 
-            concat_msg = bytearray()
-            for i_frag, frag in sorted(self.frag_map[seq_num]['frags'].items()):
-                concat_msg += frag.payload
+            offset = sum([len(frag.payload) for i_frag, frag in
+                          self.frag_map[seq_num]['frags'].items()
+                          if i_frag < pkt.frag_num])
 
-            self.frag_map[seq_num]['concat'] = concat_msg
+            self.frag_map[seq_num]['concat'][offset:offset] = pkt.payload
         else:
             self.frag_map[seq_num]['concat'] += pkt.payload
 
@@ -212,8 +226,8 @@ class BlocksatPktHandler:
 
         # Do not process a repeated fragment
         if (pkt.frag_num in self.frag_map[pkt.seq_num]['frags']):
-            logger.debug("BlocksatPktHandler: fragment {} has already "
-                         "been received".format(pkt.frag_num))
+            logger.debug("BlocksatPktHandler: fragment %s has already "
+                         "been received", pkt.frag_num)
             # Check if the repeated fragment actually has the same contents
             pre_existing_pkt = self.frag_map[pkt.seq_num]['frags'][pkt.frag_num]
             if (pkt.payload != pre_existing_pkt.payload):
@@ -247,8 +261,8 @@ class BlocksatPktHandler:
         if (not pkt.more_frags):
             self.frag_map[pkt.seq_num]['last_frag'] = pkt.frag_num
 
-        logger.debug("BlocksatPktHandler: Append fragment {}, "
-                     "Seq Num {}".format(pkt.frag_num, pkt.seq_num))
+        logger.debug("BlocksatPktHandler: Append fragment %s, "
+                     "Seq Num %s", pkt.frag_num, pkt.seq_num)
 
         return self._check_ready(pkt.seq_num)
 
@@ -281,13 +295,37 @@ class BlocksatPktHandler:
         if (not force and not self._check_ready(seq_num)):
             raise RuntimeError("Tried to decode while fragments are missing")
 
-        logger.debug("BlocksatPktHandler: Concatenated message with {} bytes "
-                     "(force: {})".format(
-                         len(self.frag_map[seq_num]['concat']), force))
+        logger.debug("BlocksatPktHandler: Concatenated message with %d bytes "
+                     "(force: %s)", len(self.frag_map[seq_num]['concat']),
+                     force)
 
         # Take the concatenated message directly from the cache
         return bytes(self.frag_map[seq_num]['concat'])
 
+    def get_concat_view(self, seq_num):
+        """Get a view of the concatenated payloads
+
+        Unlike concat(), this method does not copy the concatenated payloads
+        and does not check for fragment gaps. It is meant for inspecting the
+        message while its fragments are still arriving. The view must not be
+        used to modify the payloads.
+
+        Note:
+            The concatenation cache cannot grow while the view is held. If the
+            view is not released (e.g., by using it as a context manager)
+            before appending more packets of the same sequence number, the
+            call to append() raises BufferError.
+
+        Args:
+            seq_num : API message sequence number
+
+        Returns:
+            memoryview of the concatenated payloads
+
+        """
+        assert(seq_num in self.frag_map)
+        return memoryview(self.frag_map[seq_num]['concat'])
+
     def split(self, data, seq_num, chan_num):
         """Split data array into Blocksat Packet(s)
 
@@ -306,8 +344,8 @@ class BlocksatPktHandler:
         n_frags = ceil(len(data) / MAX_PAYLOAD)
         pkts    = list()
 
-        logger.debug("BlocksatPktHandler: Message size: {:d} bytes\t"
-                     "Fragments: {:d}".format(len(data), n_frags))
+        logger.debug("BlocksatPktHandler: Message size: %d bytes\t"
+                     "Fragments: %d", len(data), n_frags)
 
         for i_frag in range(n_frags):
             # Is this the last_fragment?
@@ -336,8 +374,8 @@ class BlocksatPktHandler:
 
         # Delete the timed-out messages
         for seq_num in timed_out:
-            logger.debug("BlocksatPktHandler: Delete Seq Num {} from fragment "
-                         "map".format(seq_num))
+            logger.debug("BlocksatPktHandler: Delete Seq Num %s from fragment "
+                         "map", seq_num)
             del self.frag_map[seq_num]
 
 
@@ -234,40 +234,41 @@ class TestApi(unittest.TestCase):
 
     def test_encapsulation_and_encryption(self):
         """Test encapsulation+encryption, then decryption+decapsulation"""
-        data = bytes([0,1,2,3])
-        gpg  = self._setup_gpg()
+        gpg = self._setup_gpg()
 
         # Message recipient:
         recipient = gpg.get_default_public_key()["fingerprint"]
 
-        # Define original message, encapsulate, and encrypt
-        tx_msg = msg.ApiMsg(data)
-        tx_msg.encapsulate()
-        tx_msg.encrypt(gpg, recipient, sign=False, trust=False)
-
-        # All data containers should be non-null at this point.
-        assert(tx_msg.data["original"] is not None)
-        assert(tx_msg.data["encapsulated"] is not None)
-        assert(tx_msg.data["encrypted"] is not None)
-
-        # ApiMsg on the Rx end (starting from the encrypted data)
-        rx_msg = msg.ApiMsg(tx_msg.get_data(), msg_format="encrypted")
-
         # Define the passphrase
         passphrase = "test"
         gpg.set_passphrase(passphrase)
 
-        # Decrypt and decapsulate
-        self.assertTrue(rx_msg.decrypt(gpg))
-        self.assertTrue(rx_msg.decapsulate())
+        # Try both a short message and a binary (non UTF-8) message
+        for data in [bytes([0,1,2,3]), bytes(range(256)) * 4]:
+            # Define original message, encapsulate, and encrypt
+            tx_msg = msg.ApiMsg(data)
+            tx_msg.encapsulate()
+            tx_msg.encrypt(gpg, recipient, sign=False, trust=False)
 
-        # Again, all data containers should be non-null at this point.
-        assert(rx_msg.data["original"] is not None)
-        assert(rx_msg.data["encapsulated"] is not None)
-        assert(rx_msg.data["encrypted"] is not None)
+            # All data containers should be non-null at this point.
+            assert(tx_msg.data["original"] is not None)
+            assert(tx_msg.data["encapsulated"] is not None)
+            assert(tx_msg.data["encrypted"] is not None)
 
-        # Check that the decrypted data matches the original
-        self.assertEqual(rx_msg.data['original'], data)
+            # ApiMsg on the Rx end (starting from the encrypted data)
+            rx_msg = msg.ApiMsg(tx_msg.get_data(), msg_format="encrypted")
+
+            # Decrypt and decapsulate
+            self.assertTrue(rx_msg.decrypt(gpg))
+            self.assertTrue(rx_msg.decapsulate())
+
+            # Again, all data containers should be non-null at this point.
+            assert(rx_msg.data["original"] is not None)
+            assert(rx_msg.data["encapsulated"] is not None)
+            assert(rx_msg.data["encrypted"] is not None)
+
+            # Check that the decrypted data matches the original
+            self.assertEqual(rx_msg.data['original'], data)
 
         self._teardown_gpg()
 
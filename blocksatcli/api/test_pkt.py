@@ -33,6 +33,20 @@ class TestOrder(unittest.TestCase):
         self.assertEqual(more_frags, rx_packet.more_frags)
         self.assertEqual(payload, rx_packet.payload)
 
+    def test_unpack_invalid(self):
+        """Test that invalid UDP payloads are discarded on unpacking"""
+        rx_packet = pkt.BlocksatPkt()
+
+        # Datagram shorter than the Blocksat Packet header
+        self.assertFalse(rx_packet.unpack(bytes(pkt.HEADER_LEN - 1)))
+
+        # Datagram without the API type bit
+        self.assertFalse(rx_packet.unpack(bytes(pkt.HEADER_LEN + 10)))
+
+        # Valid packet
+        tx_packet = pkt.BlocksatPkt(1, 0, 1, False, "Hello".encode())
+        self.assertTrue(rx_packet.unpack(tx_packet.pack()))
+
     def test_handler(self):
         """Test extraction of API message from collection of Blockst Packets"""
         # Random data
@@ -59,6 +73,10 @@ class TestOrder(unittest.TestCase):
         # Check
         self.assertEqual(data, decoded_data)
 
+        # The view of the concatenated payloads should have the same contents
+        with handler.get_concat_view(seq_num) as concat_view:
+            self.assertEqual(data, concat_view)
+
     def test_unordered_packet_handling(self):
         """Test decoding of API message from out-of-order Blocksat Packets"""
         # Random data
@@ -248,17 +248,21 @@ class Monitor():
 
         self.t_last_print = t_now
 
+        # Format the timestamped line only once for both console and log file
+        if (self.echo or self.logfile):
+            line = str(self)
+
         # Print to console
         if (self.echo):
             print_end = '\n' if self.scroll else '\r'
             if (not self.scroll):
                 sys.stdout.write("\033[K")
-            print(str(self), end=print_end)
+            print(line, end=print_end)
 
         # Append metrics to log file
         if (self.logfile):
             with open(self.logfile, 'a') as fd:
-                fd.write(str(self) + "\n")
+                fd.write(line + "\n")
 
         # Report over HTTP to a remote address
         if (self.report):
@@ -5,6 +5,30 @@ from . import rp, firewall, defs, config, dependencies, util, monitoring
 from pysnmp.hlapi import *
 logger = logging.getLogger(__name__)
 
+# Informative labels for the S400 configurations, organized by section. The
+# "{}" placeholder on the keys is replaced by the demodulator number.
+s400_cfg_labels = {
+    "Demodulator" : {
+        'ModulationStandard{}.0' : "Standard",
+        'LBandFrequency{}.0'     : "L-band Frequency",
+        'SymbolRate{}.0'         : "Symbol Rate",
+        'Modcod{}.0'             : "MODCOD",
+    },
+    "LNB Options" : {
+        'LNBSupply.0'            : "LNB Power Supply",
+        'LOFrequency.0'          : "LO Frequency",
+        'Polarization.0'         : "Polarization",
+        'Enable22KHzTone.0'      : "22 kHz Tone",
+        'LongLineCompensation.0' : "Long Line Compensation"
+    },
+    "MPE Options" : {
+        'MpePid1Pid.0'           : "MPE PID 1",
+        'MpePid1Pid.1'           : "MPE PID 2",
+        'MpePid1RowStatus.0'     : "MPE PID 1 Status",
+        'MpePid1RowStatus.1'     : "MPE PID 2 Status"
+    }
+}
+
 
 class SnmpClient():
     """SNMP Client"""
@@ -23,6 +47,12 @@ class SnmpClient():
         self.mib     = mib
         self._dump_mib()
 
+        # SNMP engine and session parameters reused across all requests
+        self._engine    = SnmpEngine()
+        self._community = CommunityData('public')
+        self._transport = UdpTransportTarget((self.address, self.port))
+        self._context   = ContextData()
+
     def _dump_mib(self):
         """Generate the compiled (.py) MIB file"""
         sudo_user = os.environ.get('SUDO_USER')
@@ -41,29 +71,47 @@ class SnmpClient():
                self.mib]
         util.run_and_log(cmd, logger=logger)
 
-    def _get(self, *variables):
-        """Get one or more variables via SNMP
+    def _get_obj_types(self, *variables):
+        """Build the SNMP object types corresponding to a set of variables
 
         Args:
-            Tuple with the variables to fetch via SNMP.
+            Tuple with the variables. Each variable can be given either by
+            name (with index 0) or as a (name, index) tuple.
 
         Returns:
-            List of tuples with the fetched keys and values.
+            List of ObjectType objects.
 
         """
         obj_types = []
         for var in variables:
-            if isinstance(var, tuple):
+            if isinstance(var, ObjectType):
+                obj = var
+            elif isinstance(var, tuple):
                 obj = ObjectType(ObjectIdentity(self.mib, var[0], var[1]))
             else:
                 obj = ObjectType(ObjectIdentity(self.mib, var, 0))
             obj_types.append(obj)
+        return obj_types
+
+    def _get(self, *variables):
+        """Get one or more variables via SNMP
+
+        Args:
+            Tuple with the variables to fetch via SNMP. Each variable can be
+            given by name, as a (name, index) tuple, or as a pre-built
+            ObjectType (see _get_obj_types).
+
+        Returns:
+            List of tuples with the fetched keys and values.
+
+        """
+        obj_types = self._get_obj_types(*variables)
 
         errorIndication, errorStatus, errorIndex, varBinds = next(
-            getCmd(SnmpEngine(),
-                   CommunityData('public'),
-                   UdpTransportTarget((self.address, self.port)),
-                   ContextData(),
+            getCmd(self._engine,
+                   self._community,
+                   self._transport,
+                   self._context,
                    *obj_types
             )
         )
@@ -78,8 +126,10 @@ class SnmpClient():
         else:
             res = list()
             for varBind in varBinds:
-                logger.debug(' = '.join([x.prettyPrint() for x in varBind]))
-                res.append(tuple([x.prettyPrint() for x in varBind]))
+                var_str = tuple([x.prettyPrint() for x in varBind])
+                if (logger.isEnabledFor(logging.DEBUG)):
+                    logger.debug(' = '.join(var_str))
+                res.append(var_str)
             return res
 
     def _set(self, variable, value):
@@ -91,10 +141,10 @@ class SnmpClient():
 
         """
         errorIndication, errorStatus, errorIndex, varBinds = next(
-            setCmd(SnmpEngine(),
-                   CommunityData('public'),
-                   UdpTransportTarget((self.address, self.port)),
-                   ContextData(),
+            setCmd(self._engine,
+                   self._community,
+                   self._transport,
+                   self._context,
                    ObjectType(ObjectIdentity(self.mib, variable, 1), value)
             )
         )
@@ -106,7 +156,7 @@ class SnmpClient():
                 errorStatus.prettyPrint(),
                 errorIndex and varBinds[int(errorIndex) - 1][0] or '?')
             )
-        else:
+        elif (logger.isEnabledFor(logging.DEBUG)):
             for varBind in varBinds:
                 logger.debug(' = '.join([x.prettyPrint() for x in varBind]))
 
@@ -117,6 +167,42 @@ class S400Client(SnmpClient):
         super().__init__(address, port, mib)
         self.demod = demod
 
+        # Build the object types polled via SNMP only once so that the MIB
+        # lookups are not repeated on every request
+        self._stats_obj_types = self._get_obj_types(
+            's400SignalLockStatus' + demod,
+            's400SignalStrength' + demod,
+            's400CarrierToNoise' + demod,
+            's400UncorrectedPackets' + demod,
+            's400BER' + demod
+        )
+        self._cfg_obj_types = self._get_obj_types(
+            's400FirmwareVersion',
+            # Demodulator
+            's400ModulationStandard' + demod,
+            's400LBandFrequency' + demod,
+            's400SymbolRate' + demod,
+            's400Modcod' + demod,
+            # LNB
+            's400LNBSupply',
+            's400LOFrequency',
+            's400Polarization',
+            's400Enable22KHzTone',
+            's400LongLineCompensation',
+            # MPE
+            ('s400MpePid1Pid', 0),
+            ('s400MpePid1Pid', 1),
+            ('s400MpePid1RowStatus', 0),
+            ('s400MpePid1RowStatus', 1)
+        )
+
+        # Flat map from each configuration key to its section and label
+        self._cfg_labels = {
+            key.format(demod) : (section, label)
+            for section, label_map in s400_cfg_labels.items()
+            for key, label in label_map.items()
+        }
+
     def get_stats(self):
         """Get demodulator statistics
 
@@ -126,13 +212,7 @@ class S400Client(SnmpClient):
             as a tuple "(value, unit)".
 
         """
-        res = self._get(
-            's400SignalLockStatus' + self.demod,
-            's400SignalStrength' + self.demod,
-            's400CarrierToNoise' + self.demod,
-            's400UncorrectedPackets' + self.demod,
-            's400BER' + self.demod
-        )
+        res = self._get(*self._stats_obj_types)
 
         if res is None:
             return
@@ -170,25 +250,7 @@ class S400Client(SnmpClient):
             successfully.
 
         """
-        res = self._get(
-            's400FirmwareVersion',
-            # Demodulator
-            's400ModulationStandard' + self.demod,
-            's400LBandFrequency' + self.demod,
-            's400SymbolRate' + self.demod,
-            's400Modcod' + self.demod,
-            # LNB
-            's400LNBSupply',
-            's400LOFrequency',
-            's400Polarization',
-            's400Enable22KHzTone',
-            's400LongLineCompensation',
-            # MPE
-            ('s400MpePid1Pid', 0),
-            ('s400MpePid1Pid', 1),
-            ('s400MpePid1RowStatus', 0),
-            ('s400MpePid1RowStatus', 1)
-        )
+        res = self._get(*self._cfg_obj_types)
 
         if (res is None):
             return False
@@ -200,45 +262,23 @@ class S400Client(SnmpClient):
             val = res[1]
             cfg[key] = val
 
-        # Map dictionary to more informative labels
-        demod_label_map = {
-            'ModulationStandard' + self.demod + '.0' : "Standard",
-            'LBandFrequency' + self.demod + '.0' : "L-band Frequency",
-            'SymbolRate' + self.demod + '.0' : "Symbol Rate",
-            'Modcod' + self.demod + '.0' : "MODCOD",
-        }
-        lnb_label_map = {
-            'LNBSupply.0' : "LNB Power Supply",
-            'LOFrequency.0' : "LO Frequency",
-            'Polarization.0' : "Polarization",
-            'Enable22KHzTone.0' : "22 kHz Tone",
-            'LongLineCompensation.0' : "Long Line Compensation"
-        }
-        mpe_label_map = {
-            'MpePid1Pid.0'       : "MPE PID 1",
-            'MpePid1Pid.1'       : "MPE PID 2",
-            'MpePid1RowStatus.0' : "MPE PID 1 Status",
-            'MpePid1RowStatus.1' : "MPE PID 2 Status"
-        }
-        label_map = {
-            "Demodulator" : demod_label_map,
-            "LNB Options" : lnb_label_map,
-            "MPE Options" : mpe_label_map
-        }
+        # Map the configurations to more informative labels, grouped by section
+        sections = {section : [] for section in s400_cfg_labels}
+        for key, val in cfg.items():
+            if (key not in self._cfg_labels):
+                continue
+            section, label = self._cfg_labels[key]
+            if (label == "MODCOD"):
+                val = "VCM" if val == "31" else val
+            elif (label == "Standard"):
+                val = val.upper()
+            sections[section].append((label, val))
 
         print("Firmware Version: {}".format(cfg['FirmwareVersion.0']))
-        for map_key in label_map:
-            print("{}:".format(map_key))
-            for key in cfg:
-                if key in label_map[map_key]:
-                    label = label_map[map_key][key]
-                    if (label == "MODCOD"):
-                        val = "VCM" if cfg[key] == "31" else cfg[key]
-                    elif (label == "Standard"):
-                        val = cfg[key].upper()
-                    else:
-                        val = cfg[key]
-                    print("- {}: {}".format(label, val))
+        for section, entries in sections.items():
+            print("{}:".format(section))
+            for label, val in entries:
+                print("- {}: {}".format(label, val))
         return True
 
 
@@ -351,20 +391,21 @@ def monitor(args):
     util._print_header("Receiver Monitoring")
 
     # Fetch the receiver stats periodically
-    c_time = time.time()
     while (True):
         try:
-            stats = s400.get_stats()
+            c_time = time.time()
+            stats  = s400.get_stats()
 
             if (stats is None):
                 return
 
             monitor.update(stats)
 
+            # Sleep only for what remains of the logging interval
             next_print = c_time + args.log_interval
-            if (next_print > c_time):
-                time.sleep(next_print - c_time)
-            c_time = time.time()
+            t_now      = time.time()
+            if (next_print > t_now):
+                time.sleep(next_print - t_now)
 
         except KeyboardInterrupt:
             break
@@ -1,5 +1,10 @@
 """Utility functions"""
 import os, textwrap, subprocess
+try:
+    # Enable line editing and history on the input() prompts (POSIX only)
+    import readline
+except ImportError:
+    pass
 
 
 def fill_print(text):
@@ -47,14 +52,12 @@ def _ask_yes_or_no(msg, default="y", help_msg = None):
         True if answer is yes, False otherwise.
 
     """
-    response = None
-
     if (default == "y"):
         options = "[Y/n]"
     else:
         options = "[N/y]"
 
-    while response not in {"y", "n"}:
+    while True:
         if (help_msg is None):
             question = msg + " " + options + " "
             raw_resp = input(question) or default
@@ -65,12 +68,12 @@ def _ask_yes_or_no(msg, default="y", help_msg = None):
             print()
             raw_resp = input("Answer " + options + " ") or default
 
-        response = raw_resp.lower()
+        response = raw_resp.strip().lower()
 
-        if (response not in ["y", "n"]):
-            print("Please enter \"y\" or \"n\"")
+        if (response in {"y", "n"}):
+            return (response == "y")
 
-    return (response == "y")
+        print("Please enter \"y\" or \"n\"")
 
 
 def _ask_multiple_choice(vec, msg, label, to_str, help_msg = None,
@@ -90,19 +93,24 @@ def _ask_multiple_choice(vec, msg, label, to_str, help_msg = None,
         Chosen element
 
     """
-    if (none_option):
-        assert(len(vec) > 0)
-    else:
-        assert(len(vec) > 1)
+    n_elem = len(vec)
+
+    if (none_option and n_elem < 1):
+        raise ValueError("At least one element is required to choose from")
+    elif (not none_option and n_elem < 2):
+        raise ValueError("At least two elements are required to choose from")
+
+    max_resp = n_elem + 1 if none_option else n_elem
 
     print(msg)
 
-    for i_elem, elem in enumerate(vec):
-        elem_str = to_str(elem)
+    # Keep the strings describing each element to echo the chosen one
+    elem_strs = [to_str(elem) for elem in vec]
+    for i_elem, elem_str in enumerate(elem_strs):
         print("[%2u] %s" %(i_elem, elem_str))
 
     if (none_option):
-        print("[%2u] %s" %(len(vec), none_str))
+        print("[%2u] %s" %(n_elem, none_str))
 
     if (help_msg is not None):
         print()
@@ -116,18 +124,17 @@ def _ask_multiple_choice(vec, msg, label, to_str, help_msg = None,
             print("Please choose a number")
             continue
 
-        max_resp = len(vec) + 1 if none_option else len(vec)
-        if (resp >= max_resp):
+        if (resp < 0 or resp >= max_resp):
             print("Please choose number from 0 to %u" %(max_resp - 1))
             resp = None
             continue
 
-        if (none_option and resp == len(vec)):
+        if (none_option and resp == n_elem):
             choice = None
             print(none_str)
         else:
             choice = vec[resp]
-            print(to_str(choice))
+            print(elem_strs[resp])
         print()
 
         return choice
@@ -136,23 +143,12 @@ def _ask_multiple_choice(vec, msg, label, to_str, help_msg = None,
 def _print_header(header, target_len=80):
     """Print section header"""
 
-    prefix      = ""
-    suffix      = ""
     header_len  = len(header) + 2
     remaining   = target_len - header_len
-    prefix_len  = int(remaining / 2)
-    suffix_len  = int(remaining / 2)
-
-    if (remaining % 1 == 1):
-        prefix_len += 1
-
-    for i in range(0, prefix_len):
-        prefix += "-"
-
-    for i in range(0, suffix_len):
-        suffix += "-"
+    suffix_len  = remaining // 2
+    prefix_len  = suffix_len + (remaining % 2)
 
-    print("\n" + prefix + " " + header + " " + suffix)
+    print("\n" + ("-" * prefix_len) + " " + header + " " + ("-" * suffix_len))
 
 
 def _print_sub_header(header, target_len=60):